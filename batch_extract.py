@@ -1,27 +1,64 @@
 from pathlib import Path
-import shutil, json
+import os, shutil, json
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from extract import extract_svo2   # keep your existing extractor
 
+try:
+    import orjson   # optional, much faster than the stdlib encoder
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, indent=2).encode("utf-8")
+
 IN_DIR = Path('/home/user/Desktop/imperial/')
 OUT_DIR = Path('/home/user/Desktop/imperial_out/')
 MAX_FRAMES = 100000
+FRAME_STRIDE = 1   # keep every Nth frame; skipped frames are grabbed but not decoded
+DEPTH_DTYPE = "float16"   # saved depth .npy dtype ("float16" or "float32")
 OUT_DIR.mkdir(exist_ok=True)
 
 SVO_PREFIX = "ZEDXMini_SN50918724"
+DONE_FLAG = ".extracted.ok"   # written last; records the SVO (mtime + size) and extraction settings
+
+# concurrent extractions; each worker opens its own camera with NEURAL_PLUS depth and
+# GEN_3 tracking on the same GPU, so GPU memory (not the core count) is the limit
+MAX_WORKERS = 2
+# PNG/npy writer threads per worker, so the workers together don't oversubscribe the cores
+WRITER_THREADS = max(1, (os.cpu_count() or 2) // MAX_WORKERS)
+
+# same camera for every capture, so serialize the intrinsics once
+_INTRINSICS_BLOB = _dumps([1272.44, 1272.67, 920.062, 618.949])
 
-for cap_dir in sorted([d for d in IN_DIR.iterdir() if d.is_dir()]):
-    # look for the target SVO inside this capture folder
-    svos = sorted(cap_dir.glob(f"{SVO_PREFIX}*.svo*"))
-    if not svos:
-        continue
+def _atomic_write_json_bytes(path, blob):
+    # write next to the target and rename over it, so an interrupted run never leaves a partial file
+    tmp = f"{path}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, blob)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
 
-    svo = svos[0]
-    out_dir = OUT_DIR / cap_dir.name
+def _run_one(job):
+    # job is a plain (svo_path, out_dir, stamp) tuple so it pickles to the workers; the
+    # extraction settings are read from the stamp so the sentinel always matches the run
+    svo, out_dir, stamp = job
+    svo = Path(svo)
+    cap_dir = svo.parent
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    # only queued when the stamp didn't match: drop the old sentinel first so an interrupted
+    # rerun can never look complete, and clear frames from earlier runs (other stride/limit/dtype)
+    (out_dir / DONE_FLAG).unlink(missing_ok=True)
+    for sub in ("images", "depth"):
+        shutil.rmtree(out_dir / sub, ignore_errors=True)
+
     # run extraction
-    extract_svo2(str(svo), str(out_dir), MAX_FRAMES)
+    extract_svo2(str(svo), str(out_dir), stamp["max_frames"],
+                 stride=stamp["stride"], depth_dtype=stamp["depth_dtype"],
+                 writer_threads=WRITER_THREADS)
 
     # copy metadata.json (or fallback)
     meta_src = cap_dir / "metadata.json"
@@ -29,11 +66,56 @@ for cap_dir in sorted([d for d in IN_DIR.iterdir() if d.is_dir()]):
     if meta_src.exists():
         shutil.copy2(meta_src, meta_dst)
     else:
-        fecha = datetime.fromtimestamp(svo.stat().st_mtime).date().isoformat()
-        with open(meta_dst, "w", encoding="utf-8") as f:
-            json.dump({"fecha": fecha, "variedad": "", "lado": ""}, f, indent=2)
+        # mtime comes from the scandir stat taken when the job was queued; no second stat
+        fecha = datetime.fromtimestamp(stamp["svo_mtime_ns"] / 1e9).date().isoformat()
+        _atomic_write_json_bytes(meta_dst, _dumps({"fecha": fecha, "variedad": "", "lado": ""}))
 
     # write intrinsics.json
-    intrinsics = [1272.44, 1272.67, 920.062, 618.949]
-    with open(out_dir / "intrinsics.json", "w", encoding="utf-8") as f:
-        json.dump(intrinsics, f, indent=2)
+    _atomic_write_json_bytes(out_dir / "intrinsics.json", _INTRINSICS_BLOB)
+
+    # mark the capture as complete only once everything else is on disk
+    _atomic_write_json_bytes(out_dir / DONE_FLAG, _dumps(stamp))
+
+def _is_done(out_dir, stamp):
+    try:
+        return (out_dir / "intrinsics.json").exists() and \
+            json.loads((out_dir / DONE_FLAG).read_bytes()) == stamp
+    except (OSError, ValueError):
+        return False
+
+def _jobs():
+    # walk the listing lazily (scandir order) so the first extraction starts as soon as
+    # its SVO is found; DirEntry caches the d_type, so no extra stat per entry
+    with os.scandir(IN_DIR) as caps:
+        for cap_dir in caps:
+            if not cap_dir.is_dir():
+                continue
+            # look for the target SVO inside this capture folder (first by name)
+            with os.scandir(cap_dir.path) as it:
+                svo = min((f for f in it
+                           if f.name.startswith(SVO_PREFIX) and ".svo" in f.name[len(SVO_PREFIX):]),
+                          key=lambda f: f.name, default=None)
+            if svo is None:
+                continue
+            out_dir = OUT_DIR / cap_dir.name
+
+            # skip captures already extracted from this exact SVO with the same settings
+            st = svo.stat()
+            stamp = {"svo_mtime_ns": st.st_mtime_ns, "svo_size": st.st_size,
+                     "max_frames": MAX_FRAMES, "stride": FRAME_STRIDE, "depth_dtype": DEPTH_DTYPE}
+            if _is_done(out_dir, stamp):
+                continue
+            yield (svo.path, out_dir, stamp)
+
+if __name__ == "__main__":
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        pending = set()
+        for job in _jobs():
+            # keep at most 2x workers queued so a huge listing never piles up in memory
+            if len(pending) >= 2 * MAX_WORKERS:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    fut.result()   # re-raise worker errors
+            pending.add(ex.submit(_run_one, job))
+        for fut in pending:
+            fut.result()
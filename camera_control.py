@@ -14,8 +14,11 @@
     Everything else (keys, ROI, behavior) is unchanged.
 """
 
+import io
 import sys
+import time
 import cv2
+import numpy as np
 import pyzed.sl as sl
 
 # Global variable 
@@ -27,6 +30,40 @@ selection_rect = sl.Rect()
 select_in_progress = False
 origin_rect = (-1,-1 )
 paused = False  # added
+# Settings cycled by 's': (setting, label used in value printouts, name announced on switch)
+SETTINGS_CYCLE = (
+    (sl.VIDEO_SETTINGS.BRIGHTNESS,               "Brightness",    "BRIGHTNESS"),
+    (sl.VIDEO_SETTINGS.CONTRAST,                 "Contrast",      "CONTRAST"),
+    (sl.VIDEO_SETTINGS.HUE,                      "Hue",           "HUE"),
+    (sl.VIDEO_SETTINGS.SATURATION,               "Saturation",    "SATURATION"),
+    (sl.VIDEO_SETTINGS.SHARPNESS,                "Sharpness",     "Sharpness"),
+    (sl.VIDEO_SETTINGS.GAIN,                     "Gain",          "GAIN"),
+    (sl.VIDEO_SETTINGS.EXPOSURE,                 "Exposure",      "EXPOSURE"),
+    (sl.VIDEO_SETTINGS.WHITEBALANCE_TEMPERATURE, "White Balance", "WHITEBALANCE"),
+)
+cycle_idx = 0
+# pollKey (OpenCV >= 4.5) pumps GUI events without waiting; older builds fall back to waitKey(1)
+poll_key = getattr(cv2, "pollKey", lambda: cv2.waitKey(1))
+
+# Hotkey feedback is buffered and written out at most every 50 ms by flush_log(),
+# which the main loop calls once per iteration.
+log_buf = io.StringIO()
+last_flush = time.monotonic()
+
+def log(msg):
+    log_buf.write(f"{msg}\n")
+
+def flush_log(force=False):
+    global last_flush
+    now = time.monotonic()
+    if not force and now - last_flush <= 0.05:
+        return
+    last_flush = now
+    if log_buf.tell():
+        sys.stdout.write(log_buf.getvalue())
+        sys.stdout.flush()
+        log_buf.seek(0)
+        log_buf.truncate()
 
 # Function that handles mouse events when interacting with the OpenCV window.
 def on_mouse(event,x,y,flags,param):
@@ -46,10 +83,20 @@ def on_mouse(event,x,y,flags,param):
         selection_rect.width = abs(x-origin_rect[0])+1
         selection_rect.height = abs(y-origin_rect[1])+1
 
+# Draw the selection rectangle (if valid) on the frame and display it
+def show_frame(win_name, img):
+    if (not selection_rect.is_empty() and selection_rect.is_contained(sl.Rect(0,0,img.shape[1],img.shape[0]))):
+        cv2.rectangle(img,(selection_rect.x,selection_rect.y),(selection_rect.width+selection_rect.x,selection_rect.height+selection_rect.y),(220, 180, 20), 2)
+    cv2.imshow(win_name, img)
+
 def main():
     global paused
 
     init = sl.InitParameters()
+    # only the LEFT image is displayed: skip the stereo/depth pipeline entirely
+    init.depth_mode = sl.DEPTH_MODE.NONE
+    init.sdk_verbose = 0
+    init.camera_disable_self_calib = True
 
     # If an SVO/SVO2 path is provided, open it instead of a live camera
     if len(sys.argv) >= 2:
@@ -65,7 +112,13 @@ def main():
         exit()
     
     runtime = sl.RuntimeParameters()
-    mat = sl.Mat() 
+    runtime.enable_depth = False
+    # two image Mats allocated once at camera resolution: grab into one while the
+    # other still backs last_frame, then swap
+    res = cam.get_camera_information().camera_configuration.resolution
+    mats = [sl.Mat(res.width, res.height, sl.MAT_TYPE.U8_C4, sl.MEM.CPU),
+            sl.Mat(res.width, res.height, sl.MAT_TYPE.U8_C4, sl.MEM.CPU)]
+    idx = 0
     win_name = "Camera Control"
     cv2.namedWindow(win_name)
     cv2.setMouseCallback(win_name,on_mouse)
@@ -74,54 +127,73 @@ def main():
     switch_camera_settings()
     key = ''
     last_frame = None
+    # reused buffer for the paused view; only refreshed when the frame or ROI changes
+    scratch = None
+    last_rect = None
 
     while key != 113:  # for 'q' key
+        idle = False
         # grab when not paused; if paused we keep showing last frame
         if not paused:
             err = cam.grab(runtime) 
             if err <= sl.ERROR_CODE.SUCCESS: # Check that a new image is successfully acquired
-                cam.retrieve_image(mat, sl.VIEW.LEFT) # Retrieve left image
-                cvImage = mat.get_data() # Convert sl.Mat to cv2.Mat
+                cam.retrieve_image(mats[idx], sl.VIEW.LEFT, sl.MEM.CPU, res) # Retrieve left image
+                cvImage = mats[idx].get_data(deep_copy=False) # numpy view over the Mat buffer
                 last_frame = cvImage
-                if (not selection_rect.is_empty() and selection_rect.is_contained(sl.Rect(0,0,cvImage.shape[1],cvImage.shape[0]))): #Check if selection rectangle is valid and draw it on the image
-                    cv2.rectangle(cvImage,(selection_rect.x,selection_rect.y),(selection_rect.width+selection_rect.x,selection_rect.height+selection_rect.y),(220, 180, 20), 2)
-                cv2.imshow(win_name, cvImage) #Display image
+                last_rect = None
+                idx ^= 1
+                show_frame(win_name, cvImage) #Display image
             else:
-                print("Error during capture : ", err)
+                log(f"Error during capture : {err}")
                 break
         else:
             # paused: keep showing the last frame if we have one
+            idle = True
             if last_frame is not None:
-                show = last_frame.copy()
-                if (not selection_rect.is_empty() and selection_rect.is_contained(sl.Rect(0,0,show.shape[1],show.shape[0]))):
-                    cv2.rectangle(show,(selection_rect.x,selection_rect.y),(selection_rect.width+selection_rect.x,selection_rect.height+selection_rect.y),(220, 180, 20), 2)
-                cv2.imshow(win_name, show)
+                if scratch is None or scratch.shape != last_frame.shape:
+                    scratch = np.empty_like(last_frame)
+                    last_rect = None
+                rect = (selection_rect.x, selection_rect.y, selection_rect.width, selection_rect.height)
+                if rect != last_rect:
+                    np.copyto(scratch, last_frame)
+                    last_rect = rect
+                    show_frame(win_name, scratch)
+                    idle = False
 
-        key = (cv2.waitKey(5) & 0xFF)
+        # paused with nothing new to draw: the window already shows scratch, so just poll keys
+        if idle:
+            time.sleep(0.02)
+            key = (poll_key() & 0xFF)
+        else:
+            key = (cv2.waitKey(1) & 0xFF)
 
         # space toggles pause/resume
         if key == 32:  # space
             paused = not paused
-            print("[Sample] Pause =", paused)
+            log(f"[Sample] Pause = {paused}")
+            flush_log()
             continue
 
         # 'n' steps one frame forward while paused (does not unpause)
         if key == 110 and paused:  # 'n'
             err = cam.grab(runtime)
             if err <= sl.ERROR_CODE.SUCCESS:
-                cam.retrieve_image(mat, sl.VIEW.LEFT)
-                cvImage = mat.get_data()
+                cam.retrieve_image(mats[idx], sl.VIEW.LEFT, sl.MEM.CPU, res)
+                cvImage = mats[idx].get_data(deep_copy=False)
                 last_frame = cvImage
-                if (not selection_rect.is_empty() and selection_rect.is_contained(sl.Rect(0,0,cvImage.shape[1],cvImage.shape[0]))):
-                    cv2.rectangle(cvImage,(selection_rect.x,selection_rect.y),(selection_rect.width+selection_rect.x,selection_rect.height+selection_rect.y),(220, 180, 20), 2)
-                cv2.imshow(win_name, cvImage)
+                last_rect = None
+                idx ^= 1
+                show_frame(win_name, cvImage)
             else:
-                print("Error during capture : ", err)
+                log(f"Error during capture : {err}")
+            flush_log()
             continue
 
         # Change camera settings with keyboard
-        update_camera_settings(key, cam, runtime, mat)
+        update_camera_settings(key, cam)
+        flush_log()
 
+    flush_log(force=True)
     cv2.destroyAllWindows()
     cam.close()
 
@@ -148,83 +220,67 @@ def print_help():
     print("* Step forward one frame:          'n'")
     print("* Exit :                           'q'\n")
 
-# update camera setting on key press
-def update_camera_settings(key, cam, runtime, mat):
+# Key handlers for update_camera_settings
+def _switch(cam):
+    # Switch camera settings
+    switch_camera_settings()
+
+def _inc(cam):
+    # Increase camera settings value.
+    current_value = cam.get_camera_settings(camera_settings)[1]
+    cam.set_camera_settings(camera_settings, current_value + step_camera_settings)
+    log(f"{str_camera_settings}: {current_value + step_camera_settings}")
+
+def _dec(cam):
+    # Decrease camera settings value.
+    current_value = cam.get_camera_settings(camera_settings)[1]
+    if current_value >= 1:
+        cam.set_camera_settings(camera_settings, current_value - step_camera_settings)
+        log(f"{str_camera_settings}: {current_value - step_camera_settings}")
+
+def _reset(cam):
+    # Reset all camera settings to default.
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.BRIGHTNESS, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.CONTRAST, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.HUE, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.SATURATION, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.SHARPNESS, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.GAIN, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.EXPOSURE, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.WHITEBALANCE_TEMPERATURE, -1)
+    log("[Sample] Reset all settings to default")
+
+def _led(cam):
+    # Turn on or off camera LED.
     global led_on
-    if key == 115:  # for 's' key
-        # Switch camera settings
-        switch_camera_settings()
-    elif key == 43:  # for '+' key
-        # Increase camera settings value.
-        current_value = cam.get_camera_settings(camera_settings)[1]
-        cam.set_camera_settings(camera_settings, current_value + step_camera_settings)
-        print(str_camera_settings + ": " + str(current_value + step_camera_settings))
-    elif key == 45:  # for '-' key
-        # Decrease camera settings value.
-        current_value = cam.get_camera_settings(camera_settings)[1]
-        if current_value >= 1:
-            cam.set_camera_settings(camera_settings, current_value - step_camera_settings)
-            print(str_camera_settings + ": " + str(current_value - step_camera_settings))
-    elif key == 114:  # for 'r' key
-        # Reset all camera settings to default.
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.BRIGHTNESS, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.CONTRAST, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.HUE, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.SATURATION, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.SHARPNESS, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.GAIN, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.EXPOSURE, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.WHITEBALANCE_TEMPERATURE, -1)
-        print("[Sample] Reset all settings to default")
-    elif key == 108: # for 'l' key
-        # Turn on or off camera LED.
-        led_on = not led_on
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.LED_STATUS, led_on)
-    elif key == 97 : # for 'a' key 
-        # Set exposure region of interest (ROI) on a target area.
-        print("[Sample] set AEC_AGC_ROI on target [",selection_rect.x,",",selection_rect.y,",",selection_rect.width,",",selection_rect.height,"]")
-        cam.set_camera_settings_roi(sl.VIDEO_SETTINGS.AEC_AGC_ROI,selection_rect,sl.SIDE.BOTH)
-    elif key == 102: #for 'f' key 
-        # Reset exposure ROI to full resolution.
-        print("[Sample] reset AEC_AGC_ROI to full res")
-        cam.set_camera_settings_roi(sl.VIDEO_SETTINGS.AEC_AGC_ROI,selection_rect,sl.SIDE.BOTH,True)
+    led_on = not led_on
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.LED_STATUS, led_on)
+
+def _roi(cam):
+    # Set exposure region of interest (ROI) on a target area.
+    log(f"[Sample] set AEC_AGC_ROI on target [ {selection_rect.x} , {selection_rect.y} , {selection_rect.width} , {selection_rect.height} ]")
+    cam.set_camera_settings_roi(sl.VIDEO_SETTINGS.AEC_AGC_ROI,selection_rect,sl.SIDE.BOTH)
+
+def _reset_roi(cam):
+    # Reset exposure ROI to full resolution.
+    log("[Sample] reset AEC_AGC_ROI to full res")
+    cam.set_camera_settings_roi(sl.VIDEO_SETTINGS.AEC_AGC_ROI,selection_rect,sl.SIDE.BOTH,True)
+
+# keycode -> handler: 's', '+', '-', 'r', 'l', 'a', 'f'
+KEY_HANDLERS = {115: _switch, 43: _inc, 45: _dec, 114: _reset, 108: _led, 97: _roi, 102: _reset_roi}
+
+# update camera setting on key press
+def update_camera_settings(key, cam):
+    handler = KEY_HANDLERS.get(key)
+    if handler is not None:
+        handler(cam)
 
 # Function to switch between different camera settings (brightness, contrast, etc.).
 def switch_camera_settings():
-    global camera_settings
-    global str_camera_settings
-    if camera_settings == sl.VIDEO_SETTINGS.BRIGHTNESS:
-        camera_settings = sl.VIDEO_SETTINGS.CONTRAST
-        str_camera_settings = "Contrast"
-        print("[Sample] Switch to camera settings: CONTRAST")
-    elif camera_settings == sl.VIDEO_SETTINGS.CONTRAST:
-        camera_settings = sl.VIDEO_SETTINGS.HUE
-        str_camera_settings = "Hue"
-        print("[Sample] Switch to camera settings: HUE")
-    elif camera_settings == sl.VIDEO_SETTINGS.HUE:
-        camera_settings = sl.VIDEO_SETTINGS.SATURATION
-        str_camera_settings = "Saturation"
-        print("[Sample] Switch to camera settings: SATURATION")
-    elif camera_settings == sl.VIDEO_SETTINGS.SATURATION:
-        camera_settings = sl.VIDEO_SETTINGS.SHARPNESS
-        str_camera_settings = "Sharpness"
-        print("[Sample] Switch to camera settings: Sharpness")
-    elif camera_settings == sl.VIDEO_SETTINGS.SHARPNESS:
-        camera_settings = sl.VIDEO_SETTINGS.GAIN
-        str_camera_settings = "Gain"
-        print("[Sample] Switch to camera settings: GAIN")
-    elif camera_settings == sl.VIDEO_SETTINGS.GAIN:
-        camera_settings = sl.VIDEO_SETTINGS.EXPOSURE
-        str_camera_settings = "Exposure"
-        print("[Sample] Switch to camera settings: EXPOSURE")
-    elif camera_settings == sl.VIDEO_SETTINGS.EXPOSURE:
-        camera_settings = sl.VIDEO_SETTINGS.WHITEBALANCE_TEMPERATURE
-        str_camera_settings = "White Balance"
-        print("[Sample] Switch to camera settings: WHITEBALANCE")
-    elif camera_settings == sl.VIDEO_SETTINGS.WHITEBALANCE_TEMPERATURE:
-        camera_settings = sl.VIDEO_SETTINGS.BRIGHTNESS
-        str_camera_settings = "Brightness"
-        print("[Sample] Switch to camera settings: BRIGHTNESS")
+    global camera_settings, str_camera_settings, cycle_idx
+    cycle_idx = (cycle_idx + 1) % len(SETTINGS_CYCLE)
+    camera_settings, str_camera_settings, announced = SETTINGS_CYCLE[cycle_idx]
+    log(f"[Sample] Switch to camera settings: {announced}")
 
 
 if __name__ == "__main__":
@@ -13,7 +13,9 @@
     - ROI removed
 """
 
+import io
 import sys
+import time
 import cv2
 import pyzed.sl as sl
 
@@ -23,6 +25,40 @@ str_camera_settings = "BRIGHTNESS"
 step_camera_settings = 1
 led_on = True
 paused = False
+# Settings cycled by 's': (setting, label used in value printouts, name announced on switch)
+SETTINGS_CYCLE = (
+    (sl.VIDEO_SETTINGS.BRIGHTNESS,               "Brightness",    "BRIGHTNESS"),
+    (sl.VIDEO_SETTINGS.CONTRAST,                 "Contrast",      "CONTRAST"),
+    (sl.VIDEO_SETTINGS.HUE,                      "Hue",           "HUE"),
+    (sl.VIDEO_SETTINGS.SATURATION,               "Saturation",    "SATURATION"),
+    (sl.VIDEO_SETTINGS.SHARPNESS,                "Sharpness",     "Sharpness"),
+    (sl.VIDEO_SETTINGS.GAIN,                     "Gain",          "GAIN"),
+    (sl.VIDEO_SETTINGS.EXPOSURE,                 "Exposure",      "EXPOSURE"),
+    (sl.VIDEO_SETTINGS.WHITEBALANCE_TEMPERATURE, "White Balance", "WHITEBALANCE"),
+)
+cycle_idx = 0
+# pollKey (OpenCV >= 4.5) pumps GUI events without waiting; older builds fall back to waitKey(1)
+poll_key = getattr(cv2, "pollKey", lambda: cv2.waitKey(1))
+
+# Hotkey feedback is buffered and written out at most every 50 ms by flush_log(),
+# which the main loop calls once per iteration.
+log_buf = io.StringIO()
+last_flush = time.monotonic()
+
+def log(msg):
+    log_buf.write(f"{msg}\n")
+
+def flush_log(force=False):
+    global last_flush
+    now = time.monotonic()
+    if not force and now - last_flush <= 0.05:
+        return
+    last_flush = now
+    if log_buf.tell():
+        sys.stdout.write(log_buf.getvalue())
+        sys.stdout.flush()
+        log_buf.seek(0)
+        log_buf.truncate()
 
 def main():
     global paused
@@ -34,6 +70,10 @@ def main():
     svo_path = sys.argv[1]
 
     init = sl.InitParameters()
+    # only the LEFT image is displayed: skip the stereo/depth pipeline entirely
+    init.depth_mode = sl.DEPTH_MODE.NONE
+    init.sdk_verbose = 0
+    init.camera_disable_self_calib = True
     init.set_from_svo_file(svo_path)
     init.svo_real_time_mode = False  # disable real-time so pause/step works better
 
@@ -44,7 +84,10 @@ def main():
         exit(1)
 
     runtime = sl.RuntimeParameters()
-    mat = sl.Mat()
+    runtime.enable_depth = False
+    # allocate the image Mat once at camera resolution and read it through a numpy view
+    res = cam.get_camera_information().camera_configuration.resolution
+    mat = sl.Mat(res.width, res.height, sl.MAT_TYPE.U8_C4, sl.MEM.CPU)
     win_name = "Camera Control (SVO)"
     cv2.namedWindow(win_name)
 
@@ -54,24 +97,32 @@ def main():
 
     key = -1
     while key != 113:  # 'q'
-        if not paused or key == 110:  # grab if playing, or stepping one frame ('n')
+        # paused and not stepping: the window already shows the last frame, so just poll keys
+        idle = paused and key != 110
+        if not idle:  # grab if playing, or stepping one frame ('n')
             err = cam.grab(runtime)
             if err == sl.ERROR_CODE.SUCCESS:
-                cam.retrieve_image(mat, sl.VIEW.LEFT)
-                cvImage = mat.get_data()
+                cam.retrieve_image(mat, sl.VIEW.LEFT, sl.MEM.CPU, res)
+                cvImage = mat.get_data(deep_copy=False)
                 cv2.imshow(win_name, cvImage)
             else:
-                print("End of SVO or error during capture:", err)
+                log(f"End of SVO or error during capture: {err}")
                 break
 
-        key = cv2.waitKey(5)
+        if idle:
+            time.sleep(0.02)
+            key = poll_key()
+        else:
+            key = cv2.waitKey(1)
         if key > 0:
             if key == 32:  # spacebar -> toggle pause
                 paused = not paused
-                print("[Sample] Pause =", paused)
+                log(f"[Sample] Pause = {paused}")
             else:
                 update_camera_settings(key, cam)
+        flush_log()
 
+    flush_log(force=True)
     cv2.destroyAllWindows()
     cam.close()
 
@@ -100,69 +151,57 @@ def print_help():
     print("* Step forward one frame:          'n'")
     print("* Exit :                           'q'\n")
 
+# Key handlers for update_camera_settings
+def _switch(cam):
+    # Switch camera settings
+    switch_camera_settings()
+
+def _inc(cam):
+    # Increase camera settings value.
+    current_value = cam.get_camera_settings(camera_settings)[1]
+    cam.set_camera_settings(camera_settings, current_value + step_camera_settings)
+    log(f"{str_camera_settings}: {current_value + step_camera_settings}")
+
+def _dec(cam):
+    # Decrease camera settings value.
+    current_value = cam.get_camera_settings(camera_settings)[1]
+    if current_value >= 1:
+        cam.set_camera_settings(camera_settings, current_value - step_camera_settings)
+        log(f"{str_camera_settings}: {current_value - step_camera_settings}")
+
+def _reset(cam):
+    # Reset all camera settings to default.
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.BRIGHTNESS, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.CONTRAST, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.HUE, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.SATURATION, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.SHARPNESS, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.GAIN, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.EXPOSURE, -1)
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.WHITEBALANCE_TEMPERATURE, -1)
+    log("[Sample] Reset all settings to default")
+
+def _led(cam):
+    # Turn on or off camera LED.
+    global led_on
+    led_on = not led_on
+    cam.set_camera_settings(sl.VIDEO_SETTINGS.LED_STATUS, led_on)
+
+# keycode -> handler: 's', '+', '-', 'r', 'l'
+KEY_HANDLERS = {115: _switch, 43: _inc, 45: _dec, 114: _reset, 108: _led}
+
 # Update camera setting on key press
 def update_camera_settings(key, cam):
-    global led_on
-    if key == 115:  # 's'
-        switch_camera_settings()
-    elif key == 43:  # '+'
-        current_value = cam.get_camera_settings(camera_settings)[1]
-        cam.set_camera_settings(camera_settings, current_value + step_camera_settings)
-        print(str_camera_settings + ": " + str(current_value + step_camera_settings))
-    elif key == 45:  # '-'
-        current_value = cam.get_camera_settings(camera_settings)[1]
-        if current_value >= 1:
-            cam.set_camera_settings(camera_settings, current_value - step_camera_settings)
-            print(str_camera_settings + ": " + str(current_value - step_camera_settings))
-    elif key == 114:  # 'r'
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.BRIGHTNESS, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.CONTRAST, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.HUE, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.SATURATION, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.SHARPNESS, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.GAIN, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.EXPOSURE, -1)
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.WHITEBALANCE_TEMPERATURE, -1)
-        print("[Sample] Reset all settings to default")
-    elif key == 108:  # 'l'
-        led_on = not led_on
-        cam.set_camera_settings(sl.VIDEO_SETTINGS.LED_STATUS, led_on)
+    handler = KEY_HANDLERS.get(key)
+    if handler is not None:
+        handler(cam)
 
 # Cycle through settings
 def switch_camera_settings():
-    global camera_settings, str_camera_settings
-    if camera_settings == sl.VIDEO_SETTINGS.BRIGHTNESS:
-        camera_settings = sl.VIDEO_SETTINGS.CONTRAST
-        str_camera_settings = "Contrast"
-        print("[Sample] Switch to camera settings: CONTRAST")
-    elif camera_settings == sl.VIDEO_SETTINGS.CONTRAST:
-        camera_settings = sl.VIDEO_SETTINGS.HUE
-        str_camera_settings = "Hue"
-        print("[Sample] Switch to camera settings: HUE")
-    elif camera_settings == sl.VIDEO_SETTINGS.HUE:
-        camera_settings = sl.VIDEO_SETTINGS.SATURATION
-        str_camera_settings = "Saturation"
-        print("[Sample] Switch to camera settings: SATURATION")
-    elif camera_settings == sl.VIDEO_SETTINGS.SATURATION:
-        camera_settings = sl.VIDEO_SETTINGS.SHARPNESS
-        str_camera_settings = "Sharpness"
-        print("[Sample] Switch to camera settings: Sharpness")
-    elif camera_settings == sl.VIDEO_SETTINGS.SHARPNESS:
-        camera_settings = sl.VIDEO_SETTINGS.GAIN
-        str_camera_settings = "Gain"
-        print("[Sample] Switch to camera settings: GAIN")
-    elif camera_settings == sl.VIDEO_SETTINGS.GAIN:
-        camera_settings = sl.VIDEO_SETTINGS.EXPOSURE
-        str_camera_settings = "Exposure"
-        print("[Sample] Switch to camera settings: EXPOSURE")
-    elif camera_settings == sl.VIDEO_SETTINGS.EXPOSURE:
-        camera_settings = sl.VIDEO_SETTINGS.WHITEBALANCE_TEMPERATURE
-        str_camera_settings = "White Balance"
-        print("[Sample] Switch to camera settings: WHITEBALANCE")
-    elif camera_settings == sl.VIDEO_SETTINGS.WHITEBALANCE_TEMPERATURE:
-        camera_settings = sl.VIDEO_SETTINGS.BRIGHTNESS
-        str_camera_settings = "Brightness"
-        print("[Sample] Switch to camera settings: BRIGHTNESS")
+    global camera_settings, str_camera_settings, cycle_idx
+    cycle_idx = (cycle_idx + 1) % len(SETTINGS_CYCLE)
+    camera_settings, str_camera_settings, announced = SETTINGS_CYCLE[cycle_idx]
+    log(f"[Sample] Switch to camera settings: {announced}")
 
 if __name__ == "__main__":
     main()
@@ -10,6 +10,7 @@ import os
 from pathlib import Path
 import cv2
 import numpy as np
+from functools import lru_cache
 import pyzed.sl as sl
 
 # Globals (unchanged names)
@@ -23,6 +24,7 @@ origin_rect = (-1, -1)
 
 # Playback mode flag + software "registers" for SVO
 is_playback = False
+bgr_scratch = None  # reused BGR frame for the playback pipeline (ZED LEFT is BGRA)
 proc_vals = {
     "BRIGHTNESS": 0,                  # [-100..100] beta
     "CONTRAST": 0,                    # [0..100] maps to alpha=1+0.02*v
@@ -35,27 +37,44 @@ proc_vals = {
 }
 
 # --- Helpers for SVO software adjustments ---
-def _apply_brightness_contrast(img, brightness, contrast_units):
-    alpha = 1.0 + 0.02 * max(0, contrast_units)  # 0..100 -> 1..3
-    beta = int(brightness)
-    return cv2.convertScaleAbs(img, alpha=alpha, beta=beta)
+# Stage output buffers reused across frames, keyed by (role, shape, dtype). Every stage
+# writes into "out" (in place once the frame is already there) and the sharpening blur
+# into "blur", so the returned image is only valid until the next call.
+_scratch = {}
+
+def _get_scratch(role, shape, dtype):
+    key = (role, shape, dtype)
+    buf = _scratch.get(key)
+    if buf is None:
+        buf = _scratch[key] = np.empty(shape, dtype)
+    return buf
 
-def _apply_hue_saturation(img, hue_units, sat_units):
-    hue_shift_deg = int(hue_units * 2)  # +/-180 deg
-    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV).astype(np.int32)
-    h, s, v = cv2.split(hsv)
-    h = (h + hue_shift_deg // 2) % 180
-    s = np.clip(s + sat_units, 0, 255)
-    hsv = cv2.merge([h.astype(np.uint8), s.astype(np.uint8), v.astype(np.uint8)])
-    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+# RGB <-> YIQ: hue is a rotation of the I/Q chroma plane, saturation its scale
+_RGB2YIQ = np.array([[0.299,  0.587,  0.114],
+                     [0.596, -0.274, -0.322],
+                     [0.211, -0.523,  0.312]], dtype=np.float64)
+_YIQ2RGB = np.linalg.inv(_RGB2YIQ)
+
+def _hue_sat_matrix(hue_units, sat_units):
+    hue_rad = hue_units * np.pi / 90.0    # [-90..90] -> +/-180 deg
+    sat_scale = 1.0 + sat_units / 100.0   # [-100..100] -> 0..2
+    c, s = np.cos(hue_rad) * sat_scale, np.sin(hue_rad) * sat_scale
+    # rotate I->-Q so a positive hue moves colours the same way as HSV H (red -> yellow)
+    rot = np.array([[1.0, 0.0, 0.0], [0.0, c, s], [0.0, -s, c]])
+    m_rgb = _YIQ2RGB @ rot @ _RGB2YIQ
+    return m_rgb[::-1, ::-1]              # RGB -> BGR channel order
+
+# 1-D Gaussian (sigma 1.2, same 9 taps GaussianBlur picks) built once; blur is row + column pass
+_SHARPEN_KERNEL = cv2.getGaussianKernel(9, 1.2, cv2.CV_32F)
 
 def _apply_sharpness(img, sharp_units):
     amount = 0.05 * max(0, sharp_units)  # 0..3.0
     if amount <= 1e-6: return img
-    blur = cv2.GaussianBlur(img, (0, 0), 1.2)
-    return cv2.addWeighted(img, 1.0 + amount, blur, -amount, 0)
+    blur = cv2.sepFilter2D(img, cv2.CV_8U, _SHARPEN_KERNEL, _SHARPEN_KERNEL,
+                           _get_scratch("blur", img.shape, img.dtype))
+    return cv2.addWeighted(img, 1.0 + amount, blur, -amount, 0, _get_scratch("out", img.shape, img.dtype))
 
-def _kelvin_to_rgb(kelvin):
+def _kelvin_to_rgb_scalar(kelvin):
     k = float(np.clip(kelvin, 1000, 12000)) / 100.0
     if k <= 66: r = 255.0
     else:
@@ -71,23 +90,49 @@ def _kelvin_to_rgb(kelvin):
         b = np.clip(b, 0.0, 255.0)
     return np.array([r, g, b], dtype=np.float32) / 255.0
 
-def _apply_wb_temperature(img, kelvin):
+# Integer kelvin -> RGB (0..1) table built once at import; lookups replace the log/pow
+# branches above. Entries below 1000 K repeat the 1000 K value, as the formula clamps.
+_KELVIN_LUT = np.stack([_kelvin_to_rgb_scalar(k) for k in range(12001)]).astype(np.float32)
+
+def _kelvin_to_rgb(kelvin):
+    return _KELVIN_LUT[min(max(int(kelvin), 0), 12000)]
+
+def _kelvin_to_scales(kelvin):
     rgb = _kelvin_to_rgb(kelvin)
     scale = rgb / max(rgb[1], 1e-6)  # normalize to green
-    out = img.astype(np.float32)
-    out[..., 2] *= scale[0]  # R
-    out[..., 1] *= scale[1]  # G
-    out[..., 0] *= scale[2]  # B
-    return np.clip(out, 0, 255).astype(np.uint8)
+    return float(scale[0]), float(scale[1]), float(scale[2])
+
+# Brightness/contrast, WB gains and hue/sat are all linear, so they fold into one affine
+# BGR matrix: out = HS @ diag(WB) @ (alpha*x + beta), clipped once at the end.
+# Rebuilt only when the settings change.
+@lru_cache(maxsize=32)
+def _color_matrix(brightness, contrast_units, kelvin, hue_units, sat_units, channels=3):
+    alpha = 1.0 + 0.02 * max(0, contrast_units)  # 0..100 -> 1..3
+    beta = int(brightness)
+    r, g, b = _kelvin_to_scales(int(kelvin))
+    m3 = _hue_sat_matrix(hue_units, sat_units) @ np.diag([b, g, r])
+    m = np.eye(channels, channels + 1, dtype=np.float32)  # extra (alpha) channel passes through
+    m[:3, :3] = alpha * m3
+    m[:3, channels] = m3.sum(axis=1) * beta
+    return m
+
+def _apply_color_matrix(img, m):
+    return cv2.transform(img, m, _get_scratch("out", img.shape, img.dtype))
 
 def apply_svo_pipeline(img):
     # combine EXPOSURE/GAIN as extra brightness; keep mapping simple
-    extra_beta = int(proc_vals["EXPOSURE"] + 0.6 * proc_vals["GAIN"])
-    img = _apply_brightness_contrast(img, proc_vals["BRIGHTNESS"] + extra_beta, proc_vals["CONTRAST"])
-    img = _apply_wb_temperature(img, proc_vals["WHITEBALANCE_TEMPERATURE"])
-    img = _apply_hue_saturation(img, proc_vals["HUE"], proc_vals["SATURATION"])
-    img = _apply_sharpness(img, proc_vals["SHARPNESS"])
-    return img
+    brightness = proc_vals["BRIGHTNESS"] + int(proc_vals["EXPOSURE"] + 0.6 * proc_vals["GAIN"])
+    contrast, hue, sat = proc_vals["CONTRAST"], proc_vals["HUE"], proc_vals["SATURATION"]
+    scale = _kelvin_to_scales(int(proc_vals["WHITEBALANCE_TEMPERATURE"]))
+    # skip stages that are identity at the current settings; all neutral -> frame as-is
+    do_bc = brightness != 0 or contrast > 0
+    do_wb = abs(scale[0] - 1) + abs(scale[1] - 1) + abs(scale[2] - 1) >= 1e-3
+    do_hs = hue != 0 or sat != 0
+    if do_bc or do_wb or do_hs:
+        m = _color_matrix(brightness, contrast, int(proc_vals["WHITEBALANCE_TEMPERATURE"]),
+                          hue, sat, img.shape[2])
+        img = _apply_color_matrix(img, m)
+    return _apply_sharpness(img, proc_vals["SHARPNESS"])
 
 # Mouse callback (unchanged)
 def on_mouse(event, x, y, flags, param):
@@ -105,7 +150,7 @@ def on_mouse(event, x, y, flags, param):
         selection_rect.height = abs(y - origin_rect[1]) + 1
 
 def main():
-    global is_playback
+    global is_playback, bgr_scratch
     init = sl.InitParameters()
 
     # If a path is provided, open SVO/SVO2
@@ -141,26 +186,33 @@ def main():
         if err == sl.ERROR_CODE.SUCCESS:
             cam.retrieve_image(mat, sl.VIEW.LEFT)
             frame = mat.get_data()
-            # Draw ROI box (visual only)
-            if (not selection_rect.is_empty() and
-                selection_rect.is_contained(sl.Rect(0, 0, frame.shape[1], frame.shape[0]))):
-                cv2.rectangle(frame,
-                              (selection_rect.x, selection_rect.y),
-                              (selection_rect.x + selection_rect.width, selection_rect.y + selection_rect.height),
-                              (220, 180, 20), 2)
             # If playback, apply software adjustments so +/− have visible effect
             if is_playback:
-                disp = apply_svo_pipeline(frame.copy())
+                # pipeline is BGR: convert the BGRA frame once into the reused scratch buffer
+                if bgr_scratch is None or bgr_scratch.shape[:2] != frame.shape[:2]:
+                    bgr_scratch = np.empty(frame.shape[:2] + (3,), dtype=np.uint8)
+                cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR, dst=bgr_scratch)
+                disp = apply_svo_pipeline(bgr_scratch)
             else:
                 disp = frame
+            # Draw ROI box (visual only), after processing so it is not colour-adjusted
+            if (not selection_rect.is_empty() and
+                selection_rect.is_contained(sl.Rect(0, 0, disp.shape[1], disp.shape[0]))):
+                cv2.rectangle(disp,
+                              (selection_rect.x, selection_rect.y),
+                              (selection_rect.x + selection_rect.width, selection_rect.y + selection_rect.height),
+                              (220, 180, 20), 2)
             cv2.imshow(win_name, disp)
         elif err == sl.ERROR_CODE.END_OF_SVOFILE_REACHED:
             print("[Info] End of SVO reached."); break
         else:
             print("Error during capture:", err); break
 
-        key = cv2.waitKey(5) & 0xFF  # normalize keycode
-        update_camera_settings(key, cam, runtime, mat)
+        # 1 ms poll instead of a 5 ms sleep per frame; no key -> nothing to dispatch
+        key = cv2.waitKeyEx(1)
+        if key != -1:
+            key &= 0xFF  # normalize keycode
+            update_camera_settings(key, cam, runtime, mat)
 
     cv2.destroyAllWindows()
     cam.close()
@@ -5,26 +5,79 @@ Module: extract_svo2.py
 Provides `extract_svo2` to extract RGB, depth, and poses from an SVO2 using ZED SDK 5.0.
 """
 import os
+import queue
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 import pyzed.sl as sl
 
+try:
+    import imagecodecs   # optional; GIL-free PNG encoder, used by the writer threads
+except ImportError:
+    imagecodecs = None
+
+# Frames handed to the writer threads but not yet on disk; the grab loop waits beyond this.
+# Also the number of BGR buffers cycled between the grab loop and the writers.
+MAX_INFLIGHT_FRAMES = 8
+
+# zlib level 1: still lossless, several times smaller than level 0 and cheaper to write
+PNG_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1, cv2.IMWRITE_PNG_STRATEGY, cv2.IMWRITE_PNG_STRATEGY_DEFAULT]
+
+# float16 tops out at 65504; finite depths beyond this are stored as NaN (not as +inf, which
+# the SDK already uses for "too far")
+FP16_DEPTH_MAX = 65000.0
+
+def _depth_to_fp16(depth):
+    # float16 mm steps: <=1 mm below 2 m, 2 mm to 4 m, 4 mm to 8 m, 8 mm to 16 m,
+    # 16 mm to 32 m, 32 mm to 65 m
+    with np.errstate(over="ignore"):
+        d16 = depth.astype(np.float16)
+    d16[(depth > FP16_DEPTH_MAX) & np.isfinite(depth)] = np.nan
+    return d16
+
+def _write_frame(img_path, img_bgr, depth_path, depth_data):
+    # runs on a writer thread; libpng/zlib and file I/O release the GIL
+    if imagecodecs is not None:
+        # same PNG (level 1) either way; imagecodecs wants contiguous RGB
+        data = imagecodecs.png_encode(cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB), level=1)
+        with open(img_path, "wb") as f:
+            f.write(data)
+    else:
+        if not cv2.imwrite(img_path, img_bgr, PNG_PARAMS):
+            raise OSError(f"cv2.imwrite failed for {img_path}")
+    np.save(depth_path, depth_data)
+
 def extract_svo2(
     svo_path: str,
     output_dir: str,
-    max_frames: int = None
+    max_frames: int = None,
+    stride: int = 1,
+    depth_dtype=np.float16,
+    writer_threads: int = None
 ) -> None:
     """
-    Extracts up to `max_frames` frames from an SVO2 file, saving:
+    Extracts up to `max_frames` frames from an SVO2 file, keeping every `stride`-th one and saving:
       - Left RGB images (lossless PNG)
-      - Depth maps (full-precision .npy)
+      - Depth maps (.npy in mm; float16 by default, see `depth_dtype`)
       - Camera poses (CSV: frame, tx, ty, tz, qx, qy, qz, qw)
 
     Parameters:
         svo_path:    Path to input .svo or .svo2 file
         output_dir:  Directory where `images/`, `depth/`, and `poses.csv` will be created
-        max_frames:  Maximum number of frames to extract (None = all frames)
+        max_frames:  Maximum number of SVO frames to read (None = all frames)
+        stride:      Keep every `stride`-th frame; skipped frames are only grabbed, never retrieved
+        depth_dtype: np.float16 (half the disk bytes) or np.float32 for the SDK's full
+                     precision; dtype names ("float16") are accepted too. float16 steps:
+                     <=1 mm below 2 m, 2 mm at 2-4 m, 4 mm at 4-8 m, 8 mm at 8-16 m,
+                     16 mm at 16-32 m, 32 mm at 32-65 m; finite values above 65 m become NaN
+        writer_threads: PNG/npy writer threads (None = min(MAX_INFLIGHT_FRAMES, cpu count));
+                     callers running several extractions at once should split the cores
     """
+    if stride < 1:
+        raise ValueError(f"stride must be >= 1, got {stride}")
+    depth_dtype = np.dtype(depth_dtype)
+
     # Prepare output dirs
     img_dir   = os.path.join(output_dir, "images")
     depth_dir = os.path.join(output_dir, "depth")
@@ -53,24 +106,47 @@ def extract_svo2(
         zed.close()
         raise RuntimeError("Could not enable positional tracking (GEN_3 + IMU fusion)")
 
-    # 3. Prepare Mats and pose container
+    # 3. Prepare Mats and pose containers (reused every frame)
     left_mat  = sl.Mat()
     depth_mat = sl.Mat()
     runtime   = sl.RuntimeParameters()
     pose      = sl.Pose()
-
-    # 4. Open CSV for poses
-    poses_csv = os.path.join(output_dir, "poses.csv")
-    with open(poses_csv, "w", newline="") as f:
-        writer = __import__('csv').writer(f)
-        writer.writerow(["frame","tx","ty","tz","qx","qy","qz","qw"])
-
-        # 5. Frame loop
+    py_trans  = sl.Translation()
+    py_orient = sl.Orientation()
+
+    # 4. Writer pool (PNG/npy writes overlap with the next grab).
+    #    BGR buffers come from `free_bgr` and go back once written, which also bounds the
+    #    frames in flight; the None slots are allocated on first use.
+    #    Leaving the block waits for every queued frame to reach the disk.
+    free_bgr = queue.Queue()
+    for _ in range(MAX_INFLIGHT_FRAMES):
+        free_bgr.put(None)
+    errors   = []
+
+    def _on_written(buf, fut):
+        free_bgr.put(buf)
+        if fut.exception() is not None:
+            errors.append(fut.exception())
+
+    if writer_threads is None:
+        writer_threads = min(MAX_INFLIGHT_FRAMES, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max(1, writer_threads)) as io_pool:
+        # 5. Frame loop; poses are collected in a preallocated array and written once at the end
         total = zed.get_svo_number_of_frames()
         limit = total if max_frames is None else min(total, max_frames)
+        poses = np.empty((-(-limit // stride), 8), dtype=np.float64)
         frame_idx = 0
+        saved = 0
         while frame_idx < limit:
+            # a writer failed (e.g. disk full): stop decoding instead of finishing the SVO
+            if errors:
+                break
             if zed.grab(runtime) == sl.ERROR_CODE.SUCCESS:
+                # grab() alone advances the SVO; skip the retrieve/convert work for dropped frames
+                if frame_idx % stride:
+                    frame_idx += 1
+                    continue
+
                 # Retrieve image & depth
                 zed.retrieve_image(left_mat, sl.VIEW.LEFT)
                 zed.retrieve_measure(depth_mat, sl.MEASURE.DEPTH)
@@ -78,43 +154,49 @@ def extract_svo2(
                 # Retrieve pose (WORLD frame)
                 zed.get_position(pose, sl.REFERENCE_FRAME.WORLD)
                 # Translation via Translation.get()
-                py_trans = sl.Translation()
                 pose.get_translation(py_trans)
                 trans = py_trans.get()  # [x, y, z]
                 tx, ty, tz = trans[0], trans[1], trans[2]
                 # Orientation via Orientation.get()
-                py_orient = sl.Orientation()
                 pose.get_orientation(py_orient)
                 orient = py_orient.get()  # [x, y, z, w]
                 ox, oy, oz, ow = orient[0], orient[1], orient[2], orient[3]
 
-                # Save RGB
-                img_rgba = left_mat.get_data()
-                img_bgr  = cv2.cvtColor(img_rgba, cv2.COLOR_BGRA2BGR)
-                cv2.imwrite(
-                    os.path.join(img_dir, f"img_{frame_idx:06d}.png"),
-                    img_bgr,
-                    [cv2.IMWRITE_PNG_COMPRESSION, 0]
-                )
-
-                # Save depth (float32 mm)
-                depth_data = depth_mat.get_data()
-                np.save(os.path.join(depth_dir, f"depth_{frame_idx:06d}.npy"), depth_data)
+                # Save RGB + depth (mm) on the writer pool. BGR goes into a free pooled buffer
+                # (blocks while all are queued); depth is cast/copied out of the Mat, which
+                # the next retrieve overwrites.
+                img_rgba   = left_mat.get_data()
+                img_bgr    = cv2.cvtColor(img_rgba, cv2.COLOR_BGRA2BGR, dst=free_bgr.get())
+                if depth_dtype == np.float16:
+                    depth_data = _depth_to_fp16(depth_mat.get_data())
+                else:
+                    depth_data = depth_mat.get_data().astype(depth_dtype)
+                io_pool.submit(
+                    _write_frame,
+                    os.path.join(img_dir, f"img_{frame_idx:06d}.png"), img_bgr,
+                    os.path.join(depth_dir, f"depth_{frame_idx:06d}.npy"), depth_data
+                ).add_done_callback(partial(_on_written, img_bgr))
 
                 # Log pose
-                writer.writerow([
-                    frame_idx,
-                    tx, ty, tz,
-                    ox, oy, oz, ow
-                ])
+                poses[saved] = (frame_idx, tx, ty, tz, ox, oy, oz, ow)
 
                 frame_idx += 1
+                saved += 1
             else:
                 break
 
-    # Cleanup
+    # Cleanup; a writer failure aborts before poses.csv is written
     zed.close()
-    print(f"✅ Extracted {frame_idx} frames (limit={limit}) to '{output_dir}'")
+    if errors:
+        raise errors[0]
+
+    # 6. Write poses.csv in one go (%.9g round-trips the SDK float32 values)
+    np.savetxt(
+        os.path.join(output_dir, "poses.csv"), poses[:saved], delimiter=",",
+        header="frame,tx,ty,tz,qx,qy,qz,qw", comments="", fmt=["%d"] + ["%.9g"] * 7
+    )
+
+    print(f"✅ Extracted {saved} of {frame_idx} frames (limit={limit}, stride={stride}) to '{output_dir}'")
 
 # Example usage:
 # extract_svo2("path/to/file.svo2", "output_dir", max_frames=100)
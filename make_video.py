@@ -1,5 +1,81 @@
-import cv2, glob 
-frames = [cv2.rotate(cv2.imread(f), cv2.ROTATE_90_CLOCKWISE) for f in sorted(glob.glob("out/images/*.png"))]
-h,w,_=frames[0].shape
-out = cv2.VideoWriter("sequoia24.mp4", cv2.VideoWriter_fourcc('*mp4v',30,(w,h)))
-[out.write(f) for f in frames]; out.release()
\ No newline at end of file
+import cv2, glob, queue, shutil, subprocess, threading
+files = sorted(glob.glob("out/images/*.png"))
+
+def nvenc_works(w, h):
+    # distro ffmpeg builds list h264_nvenc even without an NVIDIA driver, so encode one
+    # black frame at the target size and trust only a clean exit
+    try:
+        r = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "lavfi", "-i", f"color=black:s={w}x{h}",
+             "-frames:v", "1", "-c:v", "h264_nvenc", "-f", "null", "-"],
+            capture_output=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return r.returncode == 0
+
+def open_writer(path, w, h, fps=30):
+    # returns (write, close); prefers NVENC: OpenCV cudacodec, then an ffmpeg pipe, then software mp4v
+    if hasattr(cv2, "cudacodec") and cv2.cuda.getCudaEnabledDeviceCount() > 0:
+        try:
+            vw  = cv2.cudacodec.createVideoWriter(path, (w,h), cv2.cudacodec.H264, fps, cv2.cudacodec.ColorFormat_BGR)
+            gpu = cv2.cuda_GpuMat()
+            def write(img):
+                gpu.upload(img); vw.write(gpu)
+            return write, vw.release
+        except (cv2.error, AttributeError):
+            pass   # OpenCV built without the Video Codec SDK
+    if shutil.which("ffmpeg") and nvenc_works(w, h):
+        proc = subprocess.Popen(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "bgr24",
+             "-s", f"{w}x{h}", "-r", str(fps), "-i", "-",
+             "-c:v", "h264_nvenc", "-preset", "p5", "-pix_fmt", "yuv420p", path],
+            stdin=subprocess.PIPE)
+        def failed():
+            return RuntimeError(f"ffmpeg exited with status {proc.wait()} while encoding {path}")
+        def write(img):
+            try:
+                proc.stdin.write(img.data)
+            except BrokenPipeError:
+                raise failed() from None
+        def close():
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            if proc.wait() != 0:
+                raise failed()
+        return write, close
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (w,h))
+    return out.write, out.release
+
+# stream read -> rotate -> write; a reader thread decodes the next PNGs while the writer encodes.
+# The reader ends with _END, or hands its exception over the queue for the main thread to raise.
+frames = queue.Queue(maxsize=4)
+_END = object()
+def _reader():
+    try:
+        for f in files:
+            img = cv2.imread(f)
+            if img is None:
+                raise RuntimeError(f"could not read {f}")
+            frames.put(cv2.rotate(img, cv2.ROTATE_90_CLOCKWISE))
+    except Exception as e:
+        frames.put(e)
+    else:
+        frames.put(_END)
+threading.Thread(target=_reader, daemon=True).start()
+
+def next_frame():
+    item = frames.get()
+    if isinstance(item, Exception):
+        raise item
+    return item
+
+img = next_frame()
+if img is _END:
+    raise SystemExit("no frames found in out/images")
+h,w,_=img.shape
+write, close = open_writer("sequoia24.mp4", w, h)
+while img is not _END:
+    write(img); img = next_frame()
+close()
@@ -8,6 +8,7 @@ import sys, json
 from pathlib import Path
 import cv2
 import numpy as np
+from functools import lru_cache
 
 # ---------- Optional ZED frame extraction ----------
 def load_frame_from_svo(svo_path: Path):
@@ -46,13 +47,19 @@ def load_frame_from_svo(svo_path: Path):
     sys.exit(1)
 
 # ---------- Image adjustment helpers (OpenCV) ----------
-def apply_brightness_contrast(img_bgr, brightness, contrast_units):
-    # contrast_units 0..100 -> alpha 1..3
-    alpha = 1.0 + 0.02 * max(0, contrast_units)
-    beta  = int(brightness)  # -100..100
-    return cv2.convertScaleAbs(img_bgr, alpha=alpha, beta=beta)
+# Stage output buffers reused across frames, keyed by (role, shape, dtype). Every stage
+# writes into "out" (in place once the frame is already there) and the sharpening blur
+# into "blur", so the returned image is only valid until the next call.
+scratch = {}
 
-def kelvin_to_rgb(kelvin):
+def get_scratch(role, shape, dtype):
+    key = (role, shape, dtype)
+    buf = scratch.get(key)
+    if buf is None:
+        buf = scratch[key] = np.empty(shape, dtype)
+    return buf
+
+def kelvin_to_rgb_scalar(kelvin):
     k = float(np.clip(kelvin, 1000, 12000)) / 100.0
     if k <= 66: r = 255.0
     else:
@@ -68,66 +75,113 @@ def kelvin_to_rgb(kelvin):
         b = np.clip(b, 0.0, 255.0)
     return np.array([r, g, b], dtype=np.float32) / 255.0
 
-def apply_wb_temperature(img_bgr, kelvin):
+# Integer kelvin -> RGB (0..1) table built once at import; lookups replace the log/pow
+# branches above. Entries below 1000 K repeat the 1000 K value, as the formula clamps.
+KELVIN_LUT = np.stack([kelvin_to_rgb_scalar(k) for k in range(12001)]).astype(np.float32)
+
+def kelvin_to_rgb(kelvin):
+    return KELVIN_LUT[min(max(int(kelvin), 0), 12000)]
+
+def kelvin_to_scales(kelvin):
     rgb = kelvin_to_rgb(kelvin)
     scale = rgb / max(rgb[1], 1e-6)  # normalize to green for neutral pivot
-    out = img_bgr.astype(np.float32)
-    out[..., 2] *= scale[0]  # R
-    out[..., 1] *= scale[1]  # G
-    out[..., 0] *= scale[2]  # B
-    return np.clip(out, 0, 255).astype(np.uint8)
-
-def apply_hue_saturation(img_bgr, hue_units, sat_units):
-    # hue_units -90..90 -> +/-180 degrees (OpenCV H is 0..179; ~2 deg/step)
-    hue_shift_deg = int(hue_units * 2)
-    hsv = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2HSV).astype(np.int32)
-    h, s, v = cv2.split(hsv)
-    h = (h + hue_shift_deg // 2) % 180
-    s = np.clip(s + sat_units, 0, 255)
-    hsv = cv2.merge([h.astype(np.uint8), s.astype(np.uint8), v.astype(np.uint8)])
-    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+    return float(scale[0]), float(scale[1]), float(scale[2])
+
+# RGB <-> YIQ: hue is a rotation of the I/Q chroma plane, saturation its scale
+RGB2YIQ = np.array([[0.299,  0.587,  0.114],
+                    [0.596, -0.274, -0.322],
+                    [0.211, -0.523,  0.312]], dtype=np.float64)
+YIQ2RGB = np.linalg.inv(RGB2YIQ)
+
+def hue_sat_matrix(hue_units, sat_units):
+    # hue_units -90..90 -> +/-180 degrees; sat_units -100..100 -> chroma scale 0..2
+    hue_rad = hue_units * np.pi / 90.0
+    sat_scale = 1.0 + sat_units / 100.0
+    c, s = np.cos(hue_rad) * sat_scale, np.sin(hue_rad) * sat_scale
+    # rotate I->-Q so a positive hue moves colours the same way as HSV H (red -> yellow)
+    rot = np.array([[1.0, 0.0, 0.0], [0.0, c, s], [0.0, -s, c]])
+    m_rgb = YIQ2RGB @ rot @ RGB2YIQ
+    return m_rgb[::-1, ::-1]                # RGB -> BGR channel order
+
+# Brightness/contrast, WB gains and hue/sat are all linear, so they fold into one affine
+# BGR matrix: out = HS @ diag(WB) @ (alpha*x + beta), clipped once at the end.
+# Rebuilt only when the sliders change.
+@lru_cache(maxsize=32)
+def color_matrix(brightness, contrast_units, kelvin, hue_units, sat_units, channels=3):
+    alpha = 1.0 + 0.02 * max(0, contrast_units)  # contrast_units 0..100 -> alpha 1..3
+    beta  = int(brightness)                      # -100..100
+    r, g, b = kelvin_to_scales(int(kelvin))
+    m3 = hue_sat_matrix(hue_units, sat_units) @ np.diag([b, g, r])
+    m = np.eye(channels, channels + 1, dtype=np.float32)  # extra (alpha) channel passes through
+    m[:3, :3] = alpha * m3
+    m[:3, channels] = m3.sum(axis=1) * beta
+    return m
+
+def apply_color_matrix(img_bgr, m):
+    # one affine colour transform for all the per-pixel stages
+    return cv2.transform(img_bgr, m, get_scratch("out", img_bgr.shape, img_bgr.dtype))
+
+# 1-D Gaussian (sigma 1.2, same 9 taps GaussianBlur picks) built once; blur is row + column pass
+SHARPEN_KERNEL = cv2.getGaussianKernel(9, 1.2, cv2.CV_32F)
 
 def apply_sharpness(img_bgr, sharp_units):
     # amount 0..3.0 for 0..60
     amount = 0.05 * max(0, sharp_units)
     if amount <= 1e-6:
         return img_bgr
-    blur = cv2.GaussianBlur(img_bgr, (0, 0), 1.2)
-    return cv2.addWeighted(img_bgr, 1.0 + amount, blur, -amount, 0)
+    blur = cv2.sepFilter2D(img_bgr, cv2.CV_8U, SHARPEN_KERNEL, SHARPEN_KERNEL,
+                           get_scratch("blur", img_bgr.shape, img_bgr.dtype))
+    return cv2.addWeighted(img_bgr, 1.0 + amount, blur, -amount, 0, get_scratch("out", img_bgr.shape, img_bgr.dtype))
 
 def render(img0, params):
-    img = img0.copy()
     # exposure/gain preview as extra brightness (rough approximation)
-    extra_beta = int(params["EXPOSURE"] + 0.6 * params["GAIN"])
-    img = apply_brightness_contrast(img, params["BRIGHTNESS"] + extra_beta, params["CONTRAST"])
-    img = apply_wb_temperature(img, params["WHITEBALANCE_TEMPERATURE"])
-    img = apply_hue_saturation(img, params["HUE"], params["SATURATION"])
-    img = apply_sharpness(img, params["SHARPNESS"])
-    return img
+    brightness = params["BRIGHTNESS"] + int(params["EXPOSURE"] + 0.6 * params["GAIN"])
+    contrast, hue, sat = params["CONTRAST"], params["HUE"], params["SATURATION"]
+    scale = kelvin_to_scales(int(params["WHITEBALANCE_TEMPERATURE"]))
+    # skip stages that are identity at the current settings; all neutral -> frame as-is
+    do_bc = brightness != 0 or contrast > 0
+    do_wb = abs(scale[0] - 1) + abs(scale[1] - 1) + abs(scale[2] - 1) >= 1e-3
+    do_hs = hue != 0 or sat != 0
+    img = img0
+    if do_bc or do_wb or do_hs:
+        m = color_matrix(brightness, contrast, int(params["WHITEBALANCE_TEMPERATURE"]),
+                         hue, sat, img.shape[2])
+        img = apply_color_matrix(img, m)
+    return apply_sharpness(img, params["SHARPNESS"])
 
 # ---------- Trackbar plumbing ----------
+# Set by any slider move; the main loop only re-reads the sliders and re-renders when set
+_dirty = True
+
+def on_tb(v):
+    global _dirty
+    _dirty = True
+
+# Bound once: tb_get_params reads all eight sliders after every slider move
+_gtb = cv2.getTrackbarPos
+
 def tb_get_params():
     # Map trackbar positions back to SDK-like values
     return {
-        "BRIGHTNESS": cv2.getTrackbarPos("Brightness", WIN) - 100,          # [-100..100]
-        "CONTRAST":   cv2.getTrackbarPos("Contrast",   WIN),                # [0..100]
-        "HUE":        cv2.getTrackbarPos("Hue",        WIN) - 90,           # [-90..90]
-        "SATURATION": cv2.getTrackbarPos("Saturation", WIN) - 100,          # [-100..100]
-        "SHARPNESS":  cv2.getTrackbarPos("Sharpness",  WIN),                # [0..60]
-        "GAIN":       cv2.getTrackbarPos("Gain",       WIN),                # [0..100]
-        "EXPOSURE":   cv2.getTrackbarPos("Exposure",   WIN),                # [0..100]
-        "WHITEBALANCE_TEMPERATURE": 2000 + cv2.getTrackbarPos("WB_K", WIN)  # [2000..8000]
+        "BRIGHTNESS": _gtb("Brightness", WIN) - 100,          # [-100..100]
+        "CONTRAST":   _gtb("Contrast",   WIN),                # [0..100]
+        "HUE":        _gtb("Hue",        WIN) - 90,           # [-90..90]
+        "SATURATION": _gtb("Saturation", WIN) - 100,          # [-100..100]
+        "SHARPNESS":  _gtb("Sharpness",  WIN),                # [0..60]
+        "GAIN":       _gtb("Gain",       WIN),                # [0..100]
+        "EXPOSURE":   _gtb("Exposure",   WIN),                # [0..100]
+        "WHITEBALANCE_TEMPERATURE": 2000 + _gtb("WB_K", WIN)  # [2000..8000]
     }
 
 def tb_init_defaults(defaults):
-    cv2.createTrackbar("Brightness", WIN, defaults["BRIGHTNESS"] + 100, 200, lambda v: None)
-    cv2.createTrackbar("Contrast",   WIN, defaults["CONTRAST"],          100, lambda v: None)
-    cv2.createTrackbar("Hue",        WIN, defaults["HUE"] + 90,          180, lambda v: None)
-    cv2.createTrackbar("Saturation", WIN, defaults["SATURATION"] + 100,  200, lambda v: None)
-    cv2.createTrackbar("Sharpness",  WIN, defaults["SHARPNESS"],          60, lambda v: None)
-    cv2.createTrackbar("Gain",       WIN, defaults["GAIN"],              100, lambda v: None)
-    cv2.createTrackbar("Exposure",   WIN, defaults["EXPOSURE"],          100, lambda v: None)
-    cv2.createTrackbar("WB_K",       WIN, defaults["WHITEBALANCE_TEMPERATURE"] - 2000, 6000, lambda v: None)
+    cv2.createTrackbar("Brightness", WIN, defaults["BRIGHTNESS"] + 100, 200, on_tb)
+    cv2.createTrackbar("Contrast",   WIN, defaults["CONTRAST"],          100, on_tb)
+    cv2.createTrackbar("Hue",        WIN, defaults["HUE"] + 90,          180, on_tb)
+    cv2.createTrackbar("Saturation", WIN, defaults["SATURATION"] + 100,  200, on_tb)
+    cv2.createTrackbar("Sharpness",  WIN, defaults["SHARPNESS"],          60, on_tb)
+    cv2.createTrackbar("Gain",       WIN, defaults["GAIN"],              100, on_tb)
+    cv2.createTrackbar("Exposure",   WIN, defaults["EXPOSURE"],          100, on_tb)
+    cv2.createTrackbar("WB_K",       WIN, defaults["WHITEBALANCE_TEMPERATURE"] - 2000, 6000, on_tb)
 
 def print_sdk_snippet(params):
     import textwrap
@@ -178,11 +232,18 @@ def main():
     }
     tb_init_defaults(defaults)
 
-    # Loop
+    # Loop: redraw only after a slider moved, and only if the values actually changed
+    # (render writes into scratch buffers, so the last result is the whole cache)
+    global _dirty
+    params, vis = None, None
     while True:
-        params = tb_get_params()
-        vis = render(img0, params)
-        cv2.imshow(WIN, vis)
+        if _dirty:
+            _dirty = False
+            new_params = tb_get_params()
+            if new_params != params:
+                params = new_params
+                vis = render(img0, params)
+                cv2.imshow(WIN, vis)
         k = cv2.waitKey(20) & 0xFF
         if k in (27, ord('q')):  # ESC or 'q'
             break